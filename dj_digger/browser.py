@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 import logging
+import subprocess
 import time
 import webbrowser
 from typing import Callable, Iterable, Optional
 
 BROWSER_CHOICES = ["default", "chrome", "firefox", "edge", "safari", "opera"]
 
+# Browsers whose command line takes any number of urls and hands them all to the
+# running instance as new tabs, so a batch costs one process instead of one each.
+MULTI_TAB_BROWSERS = tuple(
+    getattr(webbrowser, name)
+    for name in ("Chrome", "Chromium", "Edge", "Mozilla")
+    if hasattr(webbrowser, name)  # Edge only exists from Python 3.13
+)
+
+WEB_SCHEMES = ("http://", "https://")
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -49,8 +60,32 @@ def open_urls(
     os.environ["WSLVIEW_SKIP_VALIDATION_CHECK"] = "1"
 
     controller = controller or resolve_controller(browser)
+    pending = list(enumerate(urls))
     opened = 0
-    for index, url in enumerate(urls):
+    if len(pending) > 1 and isinstance(controller, MULTI_TAB_BROWSERS):
+        # These end up on the browser's own command line, where anything that is
+        # not a web url could be read as a flag, so only those are batched.
+        batch = [(index, url) for index, url in pending if url.lower().startswith(WEB_SCHEMES)]
+        if len(batch) > 1:
+            try:
+                subprocess.Popen(
+                    [controller.name, *(url for _, url in batch)],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+            except OSError as exc:
+                LOGGER.warning("Could not launch %s (%s), opening tabs one by one", controller.name, exc)
+            else:
+                for index, url in batch:
+                    opened += 1
+                    if on_success:
+                        on_success(index, url)
+                batched = {index for index, _ in batch}
+                pending = [(index, url) for index, url in pending if index not in batched]
+
+    for index, url in pending:
         try:
             res = controller.open_new_tab(url)
             if res is False:
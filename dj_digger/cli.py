@@ -118,7 +118,12 @@ def build_parser() -> argparse.ArgumentParser:
         "--delay",
         type=float,
         default=0.5,
-        help="Delay between requests, only used by the slow HTML fallback (default: 0.5)",
+        help="Average delay between requests, only used by the slow HTML fallback (default: 0.5)",
+    )
+    dig_cmd.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Fetch every track page again instead of reusing ones scraped on an earlier dig",
     )
     _add_shared_arguments(dig_cmd)
 
@@ -209,6 +214,7 @@ def _dig_with_progress(target: str, args: argparse.Namespace, console: Console)
             limit=args.limit,
             timeout=args.timeout,
             delay=args.delay,
+            refresh=args.refresh,
             on_progress=on_progress,
         )
 
@@ -240,7 +246,9 @@ def _should_use_tui(args: argparse.Namespace) -> bool:
 
 
 def _dig_options(args: argparse.Namespace) -> dig_module.DigOptions:
-    return dig_module.DigOptions(limit=args.limit, timeout=args.timeout, delay=args.delay)
+    return dig_module.DigOptions(
+        limit=args.limit, timeout=args.timeout, delay=args.delay, refresh=args.refresh
+    )
 
 
 def handle_dig(args: argparse.Namespace) -> int:
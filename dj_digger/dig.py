@@ -8,13 +8,17 @@ an ``on_progress`` hook.
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
 
 from . import html_fallback, soundcloud
-from .models import Crate
+from .models import Crate, Track
 
 # stage, done, total (total is None while it is still unknown)
 ProgressHook = Callable[[str, int, Optional[int]], None]
@@ -23,6 +27,14 @@ STAGE_LINK = "Reading the link"
 STAGE_TRACKS = "Fetching tracks"
 STAGE_PAGES = "Scraping track pages"
 
+# Scraping is nothing but waiting on the network, so a few pages go at once. Not
+# more than a few: SoundCloud answers 429 long before the wait stops shrinking.
+SCRAPE_WORKERS = 8
+# How long to hold off when a 429 does not say, or says in a form we do not read.
+DEFAULT_RETRY_AFTER = 10.0
+# Longer than anyone will sit through; past this a dig might as well be rerun.
+MAX_RETRY_AFTER = 300.0
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -33,6 +45,7 @@ class DigOptions:
     limit: Optional[int] = None
     timeout: float = 20.0
     delay: float = 0.5
+    refresh: bool = False
 
 
 class TargetNotFound(ValueError):
@@ -45,6 +58,68 @@ class TargetNotFound(ValueError):
         self.target = target
 
 
+class TokenBucket:
+    """Paces the scrape pool as a whole rather than each worker on its own.
+
+    Allows ``rate`` requests a second on average in bursts of up to ``capacity``,
+    and nothing at all while the server has asked us to back off. A ``rate`` of
+    zero or less only honours the back-off. A ``sleep`` that returns true, as
+    ``threading.Event.wait`` does once the event is set, ends the wait early.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Optional[bool]] = time.sleep,
+    ) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._resume_at = self._updated
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._resume_at:
+                    wait = self._resume_at - now
+                elif self._rate <= 0:
+                    return
+                else:
+                    elapsed = now - max(self._updated, self._resume_at)
+                    self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+            if self._sleep(wait):
+                return
+
+    def penalize(self, seconds: float) -> None:
+        """Stop everyone for ``seconds``, then start again from an empty bucket."""
+
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
+            self._tokens = 0.0
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        seconds = float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+        return min(max(0.0, seconds), MAX_RETRY_AFTER)
+    except ValueError:
+        # The header may also be an HTTP date; erring long is fine for a 429.
+        return DEFAULT_RETRY_AFTER
+
+
 def _notify(on_progress: Optional[ProgressHook], stage: str, done: int, total: Optional[int]) -> None:
     if on_progress:
         on_progress(stage, done, total)
@@ -66,18 +141,93 @@ def dig_url(
     )
 
 
+def scrape_pages(
+    track_urls: Sequence[str],
+    *,
+    timeout: float = 20.0,
+    delay: float = 0.5,
+    refresh: bool = False,
+    on_progress: Optional[ProgressHook] = None,
+) -> List[Track]:
+    """Scrape track pages concurrently, returning tracks in the order given.
+
+    Pages scraped on an earlier dig come out of the page cache instead, unless
+    ``refresh`` asks for every one of them to be fetched again.
+    """
+
+    total = len(track_urls)
+    cache = html_fallback.PageCache()
+    results: Dict[int, Track] = {}
+    if not refresh:
+        for index, url in enumerate(track_urls):
+            cached = cache.get(url)
+            if cached is not None:
+                results[index] = cached
+    pending = [(index, url) for index, url in enumerate(track_urls) if index not in results]
+    if results:
+        LOGGER.info("%s of %s track pages came from the cache", len(results), total)
+        _notify(on_progress, STAGE_PAGES, len(results), total)
+    if not pending:
+        return [results[index] for index in range(total)]
+
+    stopping = threading.Event()
+    # Waiting on the event rather than sleeping lets an abandoned dig wake the
+    # workers out of a long back-off instead of keeping the process alive.
+    bucket = TokenBucket(1 / delay if delay > 0 else 0, SCRAPE_WORKERS, sleep=stopping.wait)
+    session = soundcloud.create_requests_session(pool_size=SCRAPE_WORKERS)
+
+    def back_off(response: requests.Response, *_args: Any, **_kwargs: Any) -> None:
+        # The session's Retry already waits out a 429 in the worker that got it;
+        # this is for when it gives up, so the other workers stop too.
+        if response.status_code == 429:
+            seconds = _retry_after(response)
+            LOGGER.warning("SoundCloud is rate limiting us, pausing for %ss", seconds)
+            bucket.penalize(seconds)
+
+    session.hooks["response"].append(back_off)
+
+    def scrape(track_url: str) -> Track:
+        bucket.acquire()
+        if stopping.is_set():
+            # A worker that was waiting its turn when the dig was abandoned.
+            raise CancelledError
+        return html_fallback.scrape_track_page(track_url, session, timeout)
+
+    pool = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS)
+    try:
+        futures = {pool.submit(scrape, url): index for index, url in pending}
+        for future in as_completed(futures):
+            track = future.result()
+            results[futures[future]] = track
+            cache.put(track)
+            _notify(on_progress, STAGE_PAGES, len(results), total)
+    except BaseException:
+        # Ctrl-C or a failing page: drop the queue rather than fetching the rest
+        # of the batch before the error gets to surface.
+        stopping.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        pool.shutdown()
+    finally:
+        session.close()
+        cache.save()
+    return [results[index] for index in range(total)]
+
+
 def dig_html(
     path: Path,
     *,
     limit: Optional[int] = None,
     timeout: float = 20.0,
     delay: float = 0.5,
+    refresh: bool = False,
     on_progress: Optional[ProgressHook] = None,
 ) -> Crate:
     """Read a saved page.
 
     Track ids in the page's hydration blob go through the fast batch hydrator;
-    only a page without them falls back to fetching each track page in turn.
+    only a page without them falls back to fetching the track pages themselves.
     """
 
     path = Path(path)
@@ -100,16 +250,9 @@ def dig_html(
             path,
             len(track_urls),
         )
-        session = soundcloud.create_requests_session()
-        tracks = []
-        try:
-            for index, track_url in enumerate(track_urls, start=1):
-                tracks.append(html_fallback.scrape_track_page(track_url, session, timeout))
-                _notify(on_progress, STAGE_PAGES, index, len(track_urls))
-                if delay > 0:
-                    time.sleep(delay)
-        finally:
-            session.close()
+        tracks = scrape_pages(
+            track_urls, timeout=timeout, delay=delay, refresh=refresh, on_progress=on_progress
+        )
     else:
         tracks = []
 
@@ -122,6 +265,7 @@ def dig(
     limit: Optional[int] = None,
     timeout: float = 20.0,
     delay: float = 0.5,
+    refresh: bool = False,
     on_progress: Optional[ProgressHook] = None,
 ) -> Crate:
     """Dig a SoundCloud link or a saved HTML file."""
@@ -133,4 +277,11 @@ def dig(
     path = Path(target).expanduser()
     if not path.exists():
         raise TargetNotFound(target)
-    return dig_html(path, limit=limit, timeout=timeout, delay=delay, on_progress=on_progress)
+    return dig_html(
+        path,
+        limit=limit,
+        timeout=timeout,
+        delay=delay,
+        refresh=refresh,
+        on_progress=on_progress,
+    )
@@ -126,8 +126,10 @@ def resolve_hypeddit_download_url(
             except Exception:
                 pass
 
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(text, "html.parser")
+        from bs4 import SoupStrainer
+
+        from .html_fallback import make_soup
+        soup = make_soup(text, SoupStrainer("input"))
         inputs = {
             tag.get("name") or tag.get("id"): tag.get("value", "")
             for tag in soup.find_all("input")
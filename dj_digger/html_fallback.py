@@ -11,21 +11,52 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .links import LINK_KEYWORDS
 from .models import Track
+from .soundcloud import cache_dir
 
+try:
+    import lxml  # noqa: F401
+except ImportError:  # pragma: no cover - depends on the install
+    # Pure Python and by far the slowest tree builder bs4 has, but always there.
+    HTML_PARSER = "html.parser"
+else:
+    HTML_PARSER = "lxml"
+
+TRACK_URL_PREFIX = "https://soundcloud.com/"
 TRACK_URL_PATTERN = re.compile(
-    r"^https://soundcloud.com/([^/]+)/([^/?#]+)(?:[/?#]|$)", re.IGNORECASE
+    r"^https://soundcloud\.com/([^/?#]+)/([^/?#]+)(?:[/?#]|$)", re.IGNORECASE
+)
+HYDRATION_RE = re.compile(r"window\.__sc_hydration\s*=\s*(\[)")
+# One C-level pass over an anchor's text instead of a substring scan per keyword.
+LINK_KEYWORD_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(LINK_KEYWORDS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+# Page text claiming a track count, best phrasing first.
+DECLARED_COUNT_PHRASE = "contains tracks"
+DECLARED_COUNT_RES = (
+    re.compile(DECLARED_COUNT_PHRASE + r"\s*(\d+)", re.IGNORECASE),
+    re.compile(r"\b(\d{1,4})\s+tracks?\b", re.IGNORECASE),
+)
+# Stretches of markup get_text leaves out, as (opening, closing) markers.
+HIDDEN_SPANS = (
+    ("<script", "</script"),
+    ("<style", "</style"),
+    ("<template", "</template"),
+    ("<!--", "-->"),
 )
-HYDRATION_RE = re.compile(r"window\.__sc_hydration\s*=\s*")
 
 RESERVED_TRACK_SLUGS = {
     "sets",
@@ -74,16 +105,25 @@ RESERVED_SECOND_SEGMENTS = {
     "popular-tracks",
 }
 
+SCRAPED_TAGS = SoupStrainer(["a", "title"])
+
+UNKNOWN_TITLE = "Unknown title"
+
+# Long enough that digging the same saved playlist again costs no requests at
+# all, short enough that a buy link an artist adds later still turns up.
+PAGE_CACHE_TTL = 7 * 24 * 60 * 60
+
 LOGGER = logging.getLogger(__name__)
 
 
 def clean_track_url(url: str) -> str:
+    if "?" not in url and "#" not in url:
+        # Most links carry nothing to strip, so skip the parse and rebuild.
+        return url
     parsed = urlparse(url)
-    cleaned_query = ""
-    if parsed.query:
-        params = [p for p in parsed.query.split("&") if not p.startswith("in=")]
-        if params:
-            cleaned_query = "?" + "&".join(params)
+    cleaned_query = parsed.query
+    if "in=" in cleaned_query:
+        cleaned_query = "&".join(p for p in cleaned_query.split("&") if not p.startswith("in="))
     cleaned = parsed._replace(query=cleaned_query, fragment="")
     return cleaned.geturl().rstrip("?")
 
@@ -101,24 +141,39 @@ def is_reserved_path(path_segments: List[str]) -> bool:
     return False
 
 
-def parse_track_links_from_html(html: str) -> Set[str]:
-    links: Set[str] = set()
-    soup = BeautifulSoup(html, "html.parser")
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def parse_track_links_from_html(html: str, soup: Optional[BeautifulSoup] = None) -> List[str]:
+    """Track urls linked from a page, each once, in the order the page has them."""
+
+    links: Dict[str, None] = {}
+    # Playlist pages link each track several times over (artwork, title, "in"
+    # context), so repeats are dropped before any of the url work below.
+    seen: Set[str] = set()
+    if soup is None:
+        soup = make_soup(html)
     for anchor in soup.find_all("a", href=True):
         href = anchor["href"]
+        if href in seen:
+            continue
+        seen.add(href)
         if href.startswith("/"):
             href = urljoin("https://soundcloud.com", href)
         match = TRACK_URL_PATTERN.match(href)
         if not match:
             continue
-        if match.group(2).lower() in RESERVED_TRACK_SLUGS:
-            continue
-        cleaned = clean_track_url(href)
-        segments = [seg for seg in urlparse(cleaned).path.split("/") if seg]
-        if len(segments) < 2 or is_reserved_path(segments):
+        # The two groups are the first two path segments, so the reserved-path
+        # check needs no url parsing; only links that survive it get cleaned.
+        user, slug = match.groups()
+        if slug.lower() in RESERVED_TRACK_SLUGS or is_reserved_path([user, slug]):
             continue
-        links.add(cleaned)
-    return links
+        # The pattern matches the host case-insensitively; spell it one way so
+        # HTTPS://SoundCloud.com/a/b and https://soundcloud.com/a/b are one track.
+        href = TRACK_URL_PREFIX + href[len(TRACK_URL_PREFIX) :]
+        links[clean_track_url(href)] = None
+    return list(links)
 
 
 def parse_hydration(html: str) -> Optional[list]:
@@ -132,11 +187,8 @@ def parse_hydration(html: str) -> Optional[list]:
     match = HYDRATION_RE.search(html)
     if not match:
         return None
-    start = html.find("[", match.end())
-    if start == -1:
-        return None
     try:
-        data, _ = json.JSONDecoder().raw_decode(html, start)
+        data, _ = json.JSONDecoder().raw_decode(html, match.start(1))
     except ValueError as exc:
         LOGGER.debug("Could not decode hydration payload: %s", exc)
         return None
@@ -191,8 +243,23 @@ def extract_from_hydration(dataset: Optional[list]) -> Tuple[List[int], Set[str]
     return ordered_ids, urls, declared
 
 
-def extract_declared_track_count(html: str) -> Optional[int]:
-    soup = BeautifulSoup(html, "html.parser")
+def _in_page_text(html: str, position: int) -> bool:
+    """Whether the markup at ``position`` is page text rather than part of a tag.
+
+    String searches instead of a parse: outside any tag, so not in an attribute
+    value, and outside the scripts, styles and comments that get_text skips.
+    """
+
+    before = html[:position]
+    if before.rfind("<") > before.rfind(">"):
+        return False
+    before = before.lower()
+    return all(before.rfind(opening) <= before.rfind(closing) for opening, closing in HIDDEN_SPANS)
+
+
+def extract_declared_track_count(html: str, soup: Optional[BeautifulSoup] = None) -> Optional[int]:
+    if soup is None:
+        soup = make_soup(html)
 
     meta = soup.find("meta", attrs={"itemprop": "numTracks"})
     if meta:
@@ -202,9 +269,18 @@ def extract_declared_track_count(html: str) -> Optional[int]:
         except (TypeError, ValueError):
             pass
 
+    # SoundCloud's own phrasing usually sits in one text node, so a search of
+    # the raw markup finds it without flattening the whole tree into a string,
+    # as long as the hit is somewhere get_text would have read. A case-insensitive
+    # regex is slow to miss on a big page; a plain substring test is not.
+    if DECLARED_COUNT_PHRASE in html.lower():
+        for match in DECLARED_COUNT_RES[0].finditer(html):
+            if _in_page_text(html, match.start()):
+                return int(match.group(1))
+
     text = soup.get_text(" ", strip=True)
-    for pattern in (r"Contains tracks\s*(\d+)", r"\b(\d{1,4})\s+tracks?\b"):
-        match = re.search(pattern, text, flags=re.IGNORECASE)
+    for pattern in DECLARED_COUNT_RES:
+        match = pattern.search(text)
         if match:
             try:
                 return int(match.group(1))
@@ -218,24 +294,33 @@ def read_html(path: Path) -> str:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"HTML file not found: {path}")
+    # Read once and decode in memory: a fully scrolled page runs to tens of
+    # megabytes, and the latin-1 retry used to read all of it off disk again.
+    data = path.read_bytes()
     try:
-        return path.read_text(encoding="utf-8")
+        return data.decode("utf-8")
     except UnicodeDecodeError:
-        return path.read_text(encoding="latin-1")
+        return data.decode("latin-1")
 
 
 def load_playlist(path: Path) -> Tuple[List[int], List[str], Optional[int]]:
     """Read a saved playlist page.
 
-    Returns track ids (fast API hydration), track urls (slow scraping fallback)
-    and the track count the page claims to hold.
+    Returns track ids (fast API hydration), track urls in page order (slow
+    scraping fallback) and the track count the page claims to hold.
     """
 
     html = read_html(path)
+    # Saved pages run to megabytes, so the tree is built once and shared.
+    soup = make_soup(html)
     track_ids, hydration_urls, declared = extract_from_hydration(parse_hydration(html))
-    urls = sorted(hydration_urls | parse_track_links_from_html(html))
+    # Page order, so that a limit keeps the first tracks of the playlist rather
+    # than the alphabetically first ones; dict.fromkeys drops the repeats.
+    urls = list(
+        dict.fromkeys([*parse_track_links_from_html(html, soup), *sorted(hydration_urls)])
+    )
     if declared is None:
-        declared = extract_declared_track_count(html)
+        declared = extract_declared_track_count(html, soup)
     return track_ids, urls, declared
 
 
@@ -246,15 +331,23 @@ def extract_title(soup: BeautifulSoup) -> str:
             if suffix in title:
                 return title.split(suffix)[0].strip()
         return title
-    return "Unknown title"
+    return UNKNOWN_TITLE
+
+
+@lru_cache(maxsize=1024)
+def _origin(url: str) -> Tuple[str, str]:
+    """Scheme and netloc of a track url, parsed once however many anchors it has."""
+
+    parsed = urlparse(url)
+    return parsed.scheme, parsed.netloc
 
 
 def normalize_link(track_url: str, href: str) -> str:
     if href.startswith("//"):
-        return f"{urlparse(track_url).scheme}:{href}"
+        return f"{_origin(track_url)[0]}:{href}"
     if href.startswith("/"):
-        parsed = urlparse(track_url)
-        return f"{parsed.scheme}://{parsed.netloc}{href}"
+        scheme, netloc = _origin(track_url)
+        return f"{scheme}://{netloc}{href}"
     if href.startswith(("http://", "https://")):
         return href
     return urljoin(track_url, href)
@@ -271,24 +364,94 @@ def scrape_track_page(
         response = session.get(track_url, timeout=timeout)
     except requests.RequestException as exc:
         LOGGER.warning("Request error for %s: %s", track_url, exc)
-        return Track(title="Unknown title", permalink_url=track_url)
+        return Track(title=UNKNOWN_TITLE, permalink_url=track_url)
 
     if response.status_code >= 400:
         LOGGER.warning("Could not retrieve %s (HTTP %s)", track_url, response.status_code)
-        return Track(title="Unknown title", permalink_url=track_url)
+        return Track(title=UNKNOWN_TITLE, permalink_url=track_url)
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Only the anchors and the title are read, so only they get built into the
+    # tree - a track page is mostly scripts and markup we never look at.
+    soup = make_soup(response.text, SCRAPED_TAGS)
     extra_links: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
     for anchor in soup.select("a[href]"):
         href = anchor["href"].strip()
-        if not href:
+        if not href or href in seen:
             continue
         text = anchor.get_text(strip=True)
-        if any(keyword in text.lower() for keyword in LINK_KEYWORDS):
+        # Only a matching anchor claims its href: the same link may turn up first
+        # under an icon with no text and only later under "Buy".
+        if LINK_KEYWORD_RE.search(text):
+            seen.add(href)
             extra_links.append((normalize_link(track_url, href), text))
 
+    LOGGER.debug("%s -> %s purchase links", track_url, len(extra_links))
     return Track(
         title=extract_title(soup),
         permalink_url=track_url,
         extra_links=extra_links,
     )
+
+
+def page_cache_path() -> Path:
+    return cache_dir() / "track_pages.json"
+
+
+def _valid_entry(entry: dict) -> bool:
+    # A hand-edited or half-written file must not blow up in the middle of a dig.
+    links = entry.get("extra_links") or []
+    return isinstance(entry.get("title", ""), str) and isinstance(links, list) and all(
+        isinstance(pair, list) and len(pair) == 2 and all(isinstance(part, str) for part in pair)
+        for pair in links
+    )
+
+
+class PageCache:
+    """What earlier scrapes found on each track page, so a re-dig skips the fetch."""
+
+    def __init__(self, path: Optional[Path] = None, *, ttl: float = PAGE_CACHE_TTL) -> None:
+        self.path = Path(path) if path else page_cache_path()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        now = time.time()
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = {}
+        for url, entry in (raw.items() if isinstance(raw, dict) else ()):
+            fetched = entry.get("fetched") if isinstance(entry, dict) else None
+            if isinstance(fetched, (int, float)) and now - fetched < ttl and _valid_entry(entry):
+                self._entries[url] = entry
+
+    def get(self, track_url: str) -> Optional[Track]:
+        entry = self._entries.get(track_url)
+        if entry is None:
+            return None
+        return Track(
+            title=entry.get("title") or UNKNOWN_TITLE,
+            permalink_url=track_url,
+            extra_links=[(url, text) for url, text in entry.get("extra_links") or []],
+        )
+
+    def put(self, track: Track) -> None:
+        # A failed fetch comes back untitled; caching it would pin the failure.
+        if track.title == UNKNOWN_TITLE:
+            return
+        self._entries[track.permalink_url] = {
+            "fetched": time.time(),
+            "title": track.title,
+            "extra_links": [list(pair) for pair in track.extra_links],
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".json.tmp")
+            temporary.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            os.replace(temporary, self.path)
+        except OSError as exc:
+            LOGGER.warning("Could not save the page cache to %s: %s", self.path, exc)
@@ -117,15 +117,28 @@ class Crate:
     declared_count: Optional[int] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class LinkRecord:
     """One categorised link belonging to one track."""
 
+    # A crate makes one of these per link, thousands for a big one. Spelled out
+    # by hand because dataclass(slots=True) needs Python 3.10.
+    __slots__ = ("category", "track", "link_url", "link_text")
+
     category: str
     track: Track
     link_url: str
     link_text: str
 
+    # What dataclass(slots=True, frozen=True) would add: without these, copy and
+    # pickle restore slots through the frozen __setattr__ and fail.
+    def __getstate__(self) -> List[Any]:
+        return [getattr(self, name) for name in self.__slots__]
+
+    def __setstate__(self, state: List[Any]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
     def as_dict(self) -> Dict[str, Any]:
         """Export shape. Keeps the v0.1 keys so old summaries stay readable."""
 
@@ -21,7 +21,7 @@ from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequ
 from urllib.parse import urlparse
 
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 
 from . import auth, gates
@@ -72,8 +72,17 @@ def _download_stem(track: Track) -> str:
     return (raw or f"track-{track.id or 'soundcloud'}")[:180]
 
 
-def create_requests_session(max_retries: int = 5, backoff_factor: float = 0.5) -> requests.Session:
-    """Return a session that backs off on rate limits and transient failures."""
+def create_requests_session(
+    max_retries: int = 5,
+    backoff_factor: float = 0.5,
+    pool_size: int = DEFAULT_POOLSIZE,
+) -> requests.Session:
+    """Return a session that backs off on rate limits and transient failures.
+
+    ``pool_size`` is how many keep-alive connections per host it holds on to;
+    anyone using the session from more threads than that pays for fresh TLS
+    handshakes on the surplus.
+    """
 
     retry_strategy = Retry(
         total=max_retries,
@@ -85,7 +94,7 @@ def create_requests_session(max_retries: int = 5, backoff_factor: float = 0.5) -
         backoff_factor=backoff_factor,
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_size)
 
     session = requests.Session()
     session.headers.update(REQUEST_HEADERS)
@@ -102,9 +111,12 @@ def is_soundcloud_url(value: str) -> bool:
     return host == "soundcloud.com" or host.endswith(".soundcloud.com")
 
 
+def cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")) / "dj-digger"
+
+
 def _client_id_cache() -> Path:
-    cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")) / "dj-digger"
-    return cache_dir / "client_id.txt"
+    return cache_dir() / "client_id.txt"
 
 
 def _chunks(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
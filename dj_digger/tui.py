@@ -1447,7 +1447,8 @@ class DiggerApp(App):
             self.notify("This crate has no source to refresh from", severity="warning")
             return
         self.crate = record
-        self._start_dig(record.source)
+        # Asking for a refresh means wanting what is online now, not the page cache.
+        self._start_dig(record.source, refresh=True)
 
     def confirm_delete_crate(self, record: Optional[CrateRecord]) -> None:
         if record is None:
@@ -1521,16 +1522,16 @@ class DiggerApp(App):
             return
         self._start_dig(target)
 
-    def _start_dig(self, target: str) -> None:
+    def _start_dig(self, target: str, *, refresh: bool = False) -> None:
         self._digging = True
         self.query_one("#tracks", DataTable).loading = True
         self._dig_message = f"Digging {target}"
         self._draw_digging()
         self._wake()
-        self.dig_in_background(target)
+        self.dig_in_background(target, refresh=refresh)
 
     @work(thread=True, exclusive=True)
-    def dig_in_background(self, target: str) -> None:
+    def dig_in_background(self, target: str, refresh: bool = False) -> None:
         def on_progress(stage: str, done: int, total: Optional[int]) -> None:
             suffix = f" {done}/{total}" if total else ""
             # The ticker draws it, so the spinner keeps turning between stages.
@@ -1542,6 +1543,7 @@ class DiggerApp(App):
                 limit=self.dig_options.limit,
                 timeout=self.dig_options.timeout,
                 delay=self.dig_options.delay,
+                refresh=refresh or self.dig_options.refresh,
                 on_progress=on_progress,
             )
         except Exception as exc:  # a worker must never take the app down with it
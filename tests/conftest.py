@@ -7,7 +7,7 @@ from typing import Any, Dict, List
 
 import pytest
 
-from dj_digger import library, state
+from dj_digger import html_fallback, library, state
 from dj_digger.models import Track
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -21,10 +21,11 @@ os.environ.setdefault("TEXTUAL_ANIMATIONS", "none")
 
 @pytest.fixture(autouse=True)
 def isolate_user_data(tmp_path, monkeypatch):
-    """Never let a test read or write the real crate library or status file."""
+    """Never let a test read or write the real crate library, status file or page cache."""
 
     monkeypatch.setattr(library, "crates_dir", lambda: tmp_path / "crates")
     monkeypatch.setattr(state, "default_state_path", lambda: tmp_path / "state.json")
+    monkeypatch.setattr(html_fallback, "page_cache_path", lambda: tmp_path / "track_pages.json")
 
 
 def load_fixture(name: str) -> Any:
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import webbrowser
+
+from dj_digger import browser
+
+
+class RecordingBrowser(webbrowser.BaseBrowser):
+    def __init__(self):
+        super().__init__("recording")
+        self.opened = []
+
+    def open(self, url, new=0, autoraise=True):
+        self.opened.append(url)
+        return True
+
+
+def test_a_multi_tab_browser_gets_every_url_in_one_launch(monkeypatch):
+    launches = []
+    monkeypatch.setattr(browser.subprocess, "Popen", lambda args, **kwargs: launches.append(args))
+    succeeded = []
+
+    opened = browser.open_urls(
+        ["https://a.example", "https://b.example"],
+        controller=webbrowser.Chrome("google-chrome"),
+        on_success=lambda index, url: succeeded.append(index),
+    )
+
+    assert opened == 2
+    assert launches == [["google-chrome", "https://a.example", "https://b.example"]]
+    assert succeeded == [0, 1]
+
+
+def test_other_browsers_still_open_tab_by_tab():
+    controller = RecordingBrowser()
+    opened = browser.open_urls(["https://a.example", "https://b.example"], controller=controller, pause=0)
+
+    assert opened == 2
+    assert controller.opened == ["https://a.example", "https://b.example"]
+
+
+def test_a_failed_launch_falls_back_to_tab_by_tab(monkeypatch):
+    def broken(args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr(browser.subprocess, "Popen", broken)
+    controller = webbrowser.Chrome("google-chrome")
+    tabs = []
+    monkeypatch.setattr(controller, "open", lambda url, new=0, autoraise=True: tabs.append(url) or True)
+
+    assert browser.open_urls(["https://a.example", "https://b.example"], controller=controller, pause=0) == 2
+    assert tabs == ["https://a.example", "https://b.example"]
+
+
+def test_only_web_urls_go_on_the_browser_command_line(monkeypatch):
+    launches = []
+    monkeypatch.setattr(browser.subprocess, "Popen", lambda args, **kwargs: launches.append(args))
+    controller = webbrowser.Chrome("google-chrome")
+    tabs = []
+    monkeypatch.setattr(controller, "open", lambda url, new=0, autoraise=True: tabs.append(url) or True)
+    succeeded = []
+
+    opened = browser.open_urls(
+        ["https://a.example", "--renderer-cmd-prefix=/bin/sh", "http://b.example"],
+        controller=controller,
+        pause=0,
+        on_success=lambda index, url: succeeded.append(index),
+    )
+
+    assert launches == [["google-chrome", "https://a.example", "http://b.example"]]
+    assert tabs == ["--renderer-cmd-prefix=/bin/sh"]
+    assert opened == 3
+    assert sorted(succeeded) == [0, 1, 2]
@@ -253,3 +253,7 @@ def test_open_recategorises_a_summary_written_by_an_older_version(tmp_path, monk
 def test_dig_options_carry_the_cli_knobs():
     options = cli._dig_options(cli.parse_cli_args(["link", "-n", "5", "--timeout", "3"]))
     assert (options.limit, options.timeout) == (5, 3.0)
+    assert options.refresh is False
+
+    options = cli._dig_options(cli.parse_cli_args(["link", "--refresh"]))
+    assert options.refresh is True
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 
 import pytest
+import requests
 
 from dj_digger import dig
 from dj_digger.models import Crate, Track
@@ -113,6 +116,130 @@ def test_a_page_without_ids_falls_back_to_scraping(tmp_path, monkeypatch):
     assert len(crate.tracks) == 2
 
 
+def test_scraped_pages_keep_page_order_when_they_finish_out_of_order(tmp_path, monkeypatch):
+    path = tmp_path / "anchors.html"
+    path.write_text(
+        '<a href="https://soundcloud.com/artist/one">a</a>'
+        '<a href="https://soundcloud.com/artist/two">b</a>',
+        encoding="utf-8",
+    )
+    two_done = threading.Event()
+
+    def fake_scrape(url, session, timeout):
+        # "one" can only finish after "two", which only works if they overlap.
+        if url.endswith("/one"):
+            assert two_done.wait(5)
+        else:
+            two_done.set()
+        return Track(title=url.rsplit("/", 1)[1], permalink_url=url)
+
+    monkeypatch.setattr("dj_digger.html_fallback.scrape_track_page", fake_scrape)
+
+    crate = dig.dig(str(path), delay=0)
+
+    assert [track.title for track in crate.tracks] == ["one", "two"]
+
+
+def test_a_second_dig_reuses_scraped_pages_unless_refreshed(tmp_path, monkeypatch):
+    path = tmp_path / "anchors.html"
+    path.write_text('<a href="https://soundcloud.com/artist/one">a</a>', encoding="utf-8")
+    scraped = []
+    monkeypatch.setattr(
+        "dj_digger.html_fallback.scrape_track_page",
+        lambda url, session, timeout: scraped.append(url)
+        or Track(title="One", permalink_url=url, extra_links=[("https://x.bandcamp.com", "Buy")]),
+    )
+
+    first = dig.dig(str(path), delay=0)
+    second = dig.dig(str(path), delay=0)
+    assert len(scraped) == 1
+    assert second.tracks == first.tracks
+
+    dig.dig(str(path), delay=0, refresh=True)
+    assert len(scraped) == 2
+
+
+def test_failed_pages_are_not_cached(tmp_path, monkeypatch):
+    path = tmp_path / "anchors.html"
+    path.write_text('<a href="https://soundcloud.com/artist/one">a</a>', encoding="utf-8")
+    scraped = []
+    monkeypatch.setattr(
+        "dj_digger.html_fallback.scrape_track_page",
+        lambda url, session, timeout: scraped.append(url)
+        or Track(title="Unknown title", permalink_url=url),
+    )
+
+    dig.dig(str(path), delay=0)
+    dig.dig(str(path), delay=0)
+
+    assert len(scraped) == 2
+
+
+def test_an_interrupted_dig_stops_fetching_pages(tmp_path, monkeypatch):
+    path = tmp_path / "anchors.html"
+    path.write_text(
+        "".join(f'<a href="https://soundcloud.com/artist/t{index}">t</a>' for index in range(64)),
+        encoding="utf-8",
+    )
+    scraped = []
+    lock = threading.Lock()
+
+    def fake_scrape(url, session, timeout):
+        with lock:
+            scraped.append(url)
+        return Track(title="s", permalink_url=url)
+
+    def interrupt(stage, done, total):
+        if stage == dig.STAGE_PAGES:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr("dj_digger.html_fallback.scrape_track_page", fake_scrape)
+
+    with pytest.raises(KeyboardInterrupt):
+        dig.dig(str(path), delay=0.05, on_progress=interrupt)
+    stopped_at = len(scraped)
+    time.sleep(0.3)
+
+    # Only the pages already in flight when the interrupt landed may finish.
+    assert len(scraped) == stopped_at
+    assert stopped_at <= 1 + dig.SCRAPE_WORKERS
+
+
+def test_an_interrupt_during_a_back_off_does_not_wait_it_out(tmp_path, monkeypatch):
+    path = tmp_path / "anchors.html"
+    path.write_text(
+        "".join(f'<a href="https://soundcloud.com/artist/t{index}">t</a>' for index in range(64)),
+        encoding="utf-8",
+    )
+    throttled = requests.Response()
+    throttled.status_code = 429
+    throttled.headers["Retry-After"] = "60"
+
+    def fake_scrape(url, session, timeout):
+        # As if SoundCloud had answered 429: the hook stops every worker.
+        for hook in session.hooks["response"]:
+            hook(throttled)
+        return Track(title="s", permalink_url=url)
+
+    def interrupt(stage, done, total):
+        if stage == dig.STAGE_PAGES:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr("dj_digger.html_fallback.scrape_track_page", fake_scrape)
+
+    started = time.monotonic()
+    with pytest.raises(KeyboardInterrupt):
+        dig.dig(str(path), delay=0, on_progress=interrupt)
+
+    # The process only exits once the workers have, so they must not sleep on.
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and any(
+        thread.name.startswith("ThreadPoolExecutor") for thread in threading.enumerate()
+    ):
+        time.sleep(0.05)
+    assert time.monotonic() - started < 5
+
+
 def test_an_empty_page_yields_an_empty_crate(tmp_path):
     path = tmp_path / "empty.html"
     path.write_text("<html><body>nothing here</body></html>", encoding="utf-8")
@@ -151,6 +278,57 @@ def test_scraping_reports_progress_per_page(tmp_path, monkeypatch):
     assert (dig.STAGE_PAGES, 1, 1) in seen
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    clock = FakeClock()
+    bucket = dig.TokenBucket(2, 2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.slept == [0.5]
+
+
+def test_token_bucket_stops_everyone_while_backing_off():
+    clock = FakeClock()
+    bucket = dig.TokenBucket(0, 8, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    bucket.penalize(3)
+    bucket.acquire()
+
+    assert clock.slept == [3]
+
+
+def test_token_bucket_stops_waiting_when_told_to():
+    stopping = threading.Event()
+    bucket = dig.TokenBucket(0, 8, sleep=stopping.wait)
+    bucket.penalize(60)
+    stopping.set()
+
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started < 1
+
+
+def test_retry_after_is_capped():
+    response = requests.Response()
+    response.headers["Retry-After"] = "86400"
+    assert dig._retry_after(response) == dig.MAX_RETRY_AFTER
+
+
 def test_default_options():
     options = dig.DigOptions()
     assert (options.limit, options.timeout, options.delay) == (None, 20.0, 0.5)
@@ -1,5 +1,8 @@
+import pytest
 import requests
 from unittest.mock import MagicMock
+
+from dj_digger import html_fallback
 from dj_digger.gates import resolve_hypeddit_download_url, resolve_toneden_download_url, resolve_gate_download_url
 
 
@@ -49,3 +52,26 @@ def test_resolve_droploud_gate():
     result = resolve_gate_download_url(url, session)
     assert result == "https://api.droploud.com/api/stream/4b0a4c1d-a3da-474d-8099-b63f3b0abe67"
 
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+def test_resolve_hypeddit_posts_the_gate_id_from_the_page_inputs(parser, monkeypatch):
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setattr(html_fallback, "HTML_PARSER", parser)
+    session = MagicMock(spec=requests.Session)
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.text = (
+        '<html><body><form><input type="hidden" name="fan_gate_id" value="98765">'
+        '<input type="hidden" name="nwSteps" value="email"></form></body></html>'
+    )
+    session.get.return_value = resp
+    session.post.return_value = MagicMock(status_code=500)
+
+    url = "https://hypeddit.com/track/abc1234"
+    assert resolve_hypeddit_download_url(url, session, config=MagicMock()) is None
+
+    posted = [call.kwargs["data"] for call in session.post.call_args_list]
+    assert posted
+    assert {payload["fan_gate_id"] for payload in posted} == {"98765"}
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import time
+
+import pytest
 
 from dj_digger import html_fallback
 
@@ -84,6 +87,13 @@ def test_missing_hydration_is_not_an_error():
     assert html_fallback.parse_hydration("<html><body>nothing</body></html>") is None
 
 
+def test_hydration_that_is_not_an_array_is_ignored():
+    """The decoder must not wander off to whatever bracket comes next."""
+
+    html = "<script>window.__sc_hydration = null; window.other = [{\"hydratable\": 1}];</script>"
+    assert html_fallback.parse_hydration(html) is None
+
+
 def test_broken_hydration_is_not_an_error():
     assert html_fallback.parse_hydration("<script>window.__sc_hydration = [{oops;</script>") is None
 
@@ -96,19 +106,56 @@ def test_anchors_are_filtered_down_to_real_tracks():
     <a href="https://soundcloud.com/artist/likes">likes</a>
     <a href="https://soundcloud.com/discover/whatever">discover</a>
     <a href="https://soundcloud.com/artist">profile</a>
+    <a href="https://soundcloud.com/artist?ref=x/not-a-track">query</a>
     <a href="https://example.com/elsewhere">elsewhere</a>
+    <a href="https://soundcloudxcom/artist/lookalike">lookalike</a>
     """
-    assert html_fallback.parse_track_links_from_html(html) == {
+    assert html_fallback.parse_track_links_from_html(html) == [
         "https://soundcloud.com/artist/a-real-track",
         "https://soundcloud.com/artist/another-track",
-    }
+    ]
 
 
 def test_playlist_context_parameter_is_stripped():
     html = '<a href="https://soundcloud.com/artist/track?in=someone/sets/thing">t</a>'
-    assert html_fallback.parse_track_links_from_html(html) == {
+    assert html_fallback.parse_track_links_from_html(html) == [
         "https://soundcloud.com/artist/track"
-    }
+    ]
+
+
+def test_only_the_playlist_context_is_stripped_from_the_query():
+    assert (
+        html_fallback.clean_track_url("https://soundcloud.com/a/b?in=x/sets/y&si=1#t=0:30")
+        == "https://soundcloud.com/a/b?si=1"
+    )
+    assert html_fallback.clean_track_url("https://soundcloud.com/a/b?si=1") == (
+        "https://soundcloud.com/a/b?si=1"
+    )
+    assert html_fallback.clean_track_url("https://soundcloud.com/a/b?") == "https://soundcloud.com/a/b"
+    assert html_fallback.clean_track_url("https://soundcloud.com/a/b") == "https://soundcloud.com/a/b"
+
+
+def test_track_links_keep_page_order_without_repeats():
+    html = """
+    <a href="https://soundcloud.com/artist/zebra">z</a>
+    <a href="https://soundcloud.com/artist/apple?in=x/sets/y">a</a>
+    <a href="https://soundcloud.com/artist/zebra">z again</a>
+    <a href="https://soundcloud.com/artist/apple">a again</a>
+    """
+    assert html_fallback.parse_track_links_from_html(html) == [
+        "https://soundcloud.com/artist/zebra",
+        "https://soundcloud.com/artist/apple",
+    ]
+
+
+def test_track_links_differing_only_in_host_case_are_one_track():
+    html = """
+    <a href="HTTPS://SoundCloud.com/Artist/Zebra">z</a>
+    <a href="https://soundcloud.com/Artist/Zebra">z again</a>
+    """
+    assert html_fallback.parse_track_links_from_html(html) == [
+        "https://soundcloud.com/Artist/Zebra",
+    ]
 
 
 def test_declared_count_comes_from_metadata_first():
@@ -116,6 +163,24 @@ def test_declared_count_comes_from_metadata_first():
     assert html_fallback.extract_declared_track_count(html) == 42
 
 
+def test_declared_count_reads_the_raw_markup_before_the_page_text(monkeypatch):
+    monkeypatch.setattr(
+        html_fallback.BeautifulSoup,
+        "get_text",
+        lambda *a, **k: pytest.fail("should not flatten the page"),
+    )
+    assert html_fallback.extract_declared_track_count("<p>Contains tracks 17</p>") == 17
+
+
+def test_declared_count_ignores_scripts_and_attributes():
+    scripted = "<script>var r='Contains tracks 99'</script><p>Contains tracks 5</p>"
+    assert html_fallback.extract_declared_track_count(scripted) == 5
+    labelled = '<div aria-label="Contains tracks 40"></div><p>12 tracks</p>'
+    assert html_fallback.extract_declared_track_count(labelled) == 12
+    commented = "<!-- Contains tracks 3 --><STYLE>/* Contains tracks 8 */</STYLE><p>Contains tracks 6</p>"
+    assert html_fallback.extract_declared_track_count(commented) == 6
+
+
 def test_declared_count_falls_back_to_page_text():
     assert html_fallback.extract_declared_track_count("<p>Contains tracks 17</p>") == 17
     assert html_fallback.extract_declared_track_count("<p>12 tracks</p>") == 12
@@ -133,6 +198,27 @@ def test_load_playlist_reads_ids_and_urls(tmp_path):
     assert declared == 2
 
 
+def test_load_playlist_parses_the_page_only_once(tmp_path, monkeypatch):
+    path = tmp_path / "saved.html"
+    path.write_text('<a href="https://soundcloud.com/artist/one">a</a>', encoding="utf-8")
+    parses = []
+    make_soup = html_fallback.make_soup
+    monkeypatch.setattr(
+        html_fallback, "make_soup", lambda html: parses.append(html) or make_soup(html)
+    )
+
+    _, urls, _ = html_fallback.load_playlist(path)
+
+    assert urls == ["https://soundcloud.com/artist/one"]
+    assert len(parses) == 1
+
+
+def test_a_page_that_is_not_utf8_still_reads(tmp_path):
+    path = tmp_path / "saved.html"
+    path.write_bytes("<title>Café | SoundCloud</title>".encode("latin-1"))
+    assert html_fallback.read_html(path) == "<title>Café | SoundCloud</title>"
+
+
 def test_title_loses_the_soundcloud_suffix():
     from bs4 import BeautifulSoup
 
@@ -140,8 +226,78 @@ def test_title_loses_the_soundcloud_suffix():
     assert html_fallback.extract_title(soup) == "Great Set"
 
 
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+
+class FakeSession:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.text)
+
+
+def test_scraping_keeps_only_anchors_that_look_like_purchase_links():
+    page = """
+    <title>Great Track | SoundCloud</title>
+    <a href="https://x.bandcamp.com/track/y">BUY on Bandcamp</a>
+    <a href="/pages/cookies">Cookie policy</a>
+    <a href="//hypeddit.com/track/z">Free Download</a>
+    """
+    track = html_fallback.scrape_track_page(
+        "https://soundcloud.com/artist/track", FakeSession(page)
+    )
+
+    assert track.title == "Great Track"
+    assert track.extra_links == [
+        ("https://x.bandcamp.com/track/y", "BUY on Bandcamp"),
+        ("https://hypeddit.com/track/z", "Free Download"),
+    ]
+
+
+def test_scraping_reports_a_repeated_link_once():
+    page = """
+    <a href="https://x.bandcamp.com/track/y"><img src="art.jpg"></a>
+    <a href="https://x.bandcamp.com/track/y">Buy</a>
+    <a href="https://x.bandcamp.com/track/y">Buy it again</a>
+    """
+    track = html_fallback.scrape_track_page(
+        "https://soundcloud.com/artist/track", FakeSession(page)
+    )
+
+    assert track.extra_links == [("https://x.bandcamp.com/track/y", "Buy")]
+
+
 def test_relative_links_are_resolved_against_the_track():
     track = "https://soundcloud.com/artist/track"
     assert html_fallback.normalize_link(track, "/help") == "https://soundcloud.com/help"
     assert html_fallback.normalize_link(track, "//cdn.example.com/x") == "https://cdn.example.com/x"
     assert html_fallback.normalize_link(track, "https://x.com/y") == "https://x.com/y"
+
+
+def test_malformed_page_cache_entries_are_dropped_on_load(tmp_path):
+    path = tmp_path / "pages.json"
+    path.write_text(
+        json.dumps(
+            {
+                "https://soundcloud.com/a/good": {
+                    "fetched": time.time(),
+                    "title": "Good",
+                    "extra_links": [["https://x.bandcamp.com", "Buy"]],
+                },
+                "https://soundcloud.com/a/bad": {
+                    "fetched": time.time(),
+                    "title": "Bad",
+                    "extra_links": [["https://x.bandcamp.com"], 7],
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    cache = html_fallback.PageCache(path)
+
+    assert cache.get("https://soundcloud.com/a/good").extra_links == [("https://x.bandcamp.com", "Buy")]
+    assert cache.get("https://soundcloud.com/a/bad") is None
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import copy
 import csv
 import json
+import pickle
 
 import pytest
 
@@ -339,6 +341,27 @@ def test_export_json_roundtrips(tmp_path, tracks):
     }
 
 
+def test_export_json_is_the_same_with_or_without_orjson(tmp_path, tracks, monkeypatch):
+    records = links.categorise_all(tracks)
+    fast = links.export_records(records, "json", tmp_path / "fast.json")
+    monkeypatch.setattr(links, "orjson", None)
+    plain = links.export_records(records, "json", tmp_path / "plain.json")
+
+    assert fast.read_bytes() == plain.read_bytes()
+
+
+def test_export_yaml_is_the_same_with_or_without_libyaml(tmp_path, tracks, monkeypatch):
+    yaml = pytest.importorskip("yaml")
+    records = links.categorise_all(tracks)
+    fast = links.export_records(records, "yaml", tmp_path / "fast.yaml")
+    monkeypatch.setattr(yaml, "CSafeDumper", yaml.SafeDumper, raising=False)
+    plain = links.export_records(records, "yaml", tmp_path / "plain.yaml")
+
+    assert fast.read_bytes() == plain.read_bytes()
+    as_json = links.export_records(records, "json", tmp_path / "out.json")
+    assert links.load_summary(fast) == links.load_summary(as_json)
+
+
 def test_export_json_keeps_the_v01_keys(tmp_path, tracks):
     path = links.export_records(links.categorise_all(tracks), "json", tmp_path / "out.json")
     entry = next(item for items in json.loads(path.read_text()).values() for item in items)
@@ -371,3 +394,13 @@ def test_load_summary_rejects_a_non_mapping(tmp_path):
     path.write_text("[]", encoding="utf-8")
     with pytest.raises(ValueError, match="mapping"):
         links.load_summary(path)
+
+
+def test_records_are_frozen_but_still_copy_and_pickle(tracks):
+    record = links.categorise(tracks[0])[0]
+    with pytest.raises(AttributeError):
+        record.link_url = "https://elsewhere.example"
+
+    assert copy.copy(record) == record
+    assert copy.deepcopy(record) == record
+    assert pickle.loads(pickle.dumps(record)) == record
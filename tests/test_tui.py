@@ -514,6 +514,7 @@ def test_the_target_is_passed_through_with_the_dig_options(state, monkeypatch):
     assert seen["target"] == "playlist.html"
     assert seen["kwargs"]["limit"] == 7
     assert seen["kwargs"]["timeout"] == 5.0
+    assert seen["kwargs"]["refresh"] is False
 
 
 def test_cancelling_with_nothing_loaded_quits(state, monkeypatch):
@@ -673,11 +674,14 @@ def test_refreshing_redigs_the_saved_source_and_keeps_deletions(state, monkeypat
     record.remove("501")
     library.save(record)
 
-    # Like the real dig, which reports back the source it was given.
-    monkeypatch.setattr(
-        "dj_digger.dig.dig",
-        lambda target, **kwargs: crate_of(4, title="Refreshed", source=target),
-    )
+    seen = {}
+
+    def fake_dig(target, **kwargs):
+        seen.update(kwargs)
+        # Like the real dig, which reports back the source it was given.
+        return crate_of(4, title="Refreshed", source=target)
+
+    monkeypatch.setattr("dj_digger.dig.dig", fake_dig)
     app = make_app([], state, export_format="none")
 
     async def scenario():
@@ -692,6 +696,8 @@ def test_refreshing_redigs_the_saved_source_and_keeps_deletions(state, monkeypat
     assert reloaded.refreshed_at
     assert len(reloaded.tracks) == 4
     assert reloaded.removed_track_keys == ["501"]
+    # A refresh the user asked for skips the page cache.
+    assert seen["refresh"] is True
 
 
 def test_deleting_a_crate_asks_first(state):